@@ -2,18 +2,20 @@
 Example for using ParallelZipFile to read multiple files in parallel using a
 ThreadPool. With zipfile.ZipFile, this would crash instead.
 """
-import zlib
 from multiprocessing.pool import ThreadPool
 
 from parallelzipfile import ParallelZipFile as ZipFile
+from parallelzipfile import crc32
 
 
 def do_something_with_file(info):
     """Checking file integrity."""
 
-    data = z.read(info.filename)
+    # copy=False avoids copying data out of the zip file for uncompressed
+    # files. crc32 accepts the resulting memoryview directly.
+    data = z.read(info.filename, copy=False)
 
-    computed_crc = zlib.crc32(data)
+    computed_crc = crc32(data)
 
     assert computed_crc == info.CRC
 
@@ -9,21 +9,110 @@ http://web.archive.org/web/20210225050454/https://pkware.cachefly.net/webdocs/ca
 """
 
 import bz2
+import concurrent.futures
+import functools
 import lzma
 import mmap
+import multiprocessing
+import os
 import struct
 import zlib
-from typing import IO, Dict, List, Optional, no_type_check
+from multiprocessing import shared_memory
+from typing import (
+    IO,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+    no_type_check,
+)
+
+try:
+    # libdeflate decompresses DEFLATE data roughly twice as fast as zlib,
+    # but only supports one-shot (non-streaming) decompression. This is fine
+    # here because the uncompressed size is known from the central directory.
+    import deflate
+
+    HAVE_LIBDEFLATE = True
+except ImportError:
+    HAVE_LIBDEFLATE = False
+
+try:
+    # Intel ISA-L provides a SIMD-accelerated DEFLATE decoder which is about
+    # twice as fast as zlib on modern x86. Used when libdeflate is missing.
+    from isal import isal_zlib
+
+    HAVE_ISAL = True
+except ImportError:
+    HAVE_ISAL = False
+
+try:
+    # NumPy is used to parse all central directory headers in one vectorized
+    # pass when possible, which is much faster than a Python loop for zip
+    # files with many stored files.
+    import numpy as np
+
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+# CRC32 computed with carry-less multiplication instructions (libdeflate or
+# ISA-L) is many times faster than zlib's table-based implementation. The
+# annotation bridges the slightly different signatures of the three
+# implementations.
+crc32: Callable[..., int]
+if HAVE_LIBDEFLATE:
+    crc32 = deflate.crc32
+elif HAVE_ISAL:
+    crc32 = isal_zlib.crc32
+else:
+    crc32 = zlib.crc32
+
+
+# Precompiled structs skip the format string parse on every call and
+# unpack_from reads directly from the mmap without slicing out a bytes object.
+_EOCD_STRUCT = struct.Struct("<IHHHHIIH")
+_EOCD64_STRUCT = struct.Struct("<IQHHII4Q")
+_CD_HEADER_STRUCT = struct.Struct("<I6H3I5HII")
+_LOCAL_HEADER_STRUCT = struct.Struct("<IHHHHHIIIHH")
+
+# Signatures are unpacked as little-endian integers. Comparing a single int
+# is cheaper than comparing a bytes slice against b"PK\x01\x02" etc.
+_EOCD_SIGNATURE = 0x06054B50
+_EOCD64_SIGNATURE = 0x06064B50
+_CD_HEADER_SIGNATURE = 0x02014B50
+_LOCAL_HEADER_SIGNATURE = 0x04034B50
+
+# Central directory headers can be parsed from an mmap of the whole zip file
+# or from plain bytes read with os.pread.
+_Buffer = Union[bytes, mmap.mmap]
 
 
 class ZipInfo:
     """Contains information about a file stored in a ParallelZipFile."""
 
+    # Without a per-instance __dict__, a ZipInfo is several times smaller,
+    # which matters for zip files with hundreds of thousands of entries.
+    __slots__ = (
+        "filename",
+        "header_offset",
+        "CRC",
+        "compress_size",
+        "file_size",
+        "compress_type",
+        "data_offset",
+    )
+
     filename: str
     header_offset: int
     CRC: int
     compress_size: int
     file_size: int
+    compress_type: int
+    data_offset: Optional[int]
 
     def __init__(
         self,
@@ -32,33 +121,173 @@ class ZipInfo:
         CRC: int,
         compress_size: int,
         file_size: int,
+        *,
+        compress_type: int = -1,
     ) -> None:
         self.filename = filename
         self.header_offset = header_offset
         self.CRC = CRC
         self.compress_size = compress_size
         self.file_size = file_size
+        # -1 means unknown; determined from the local file header on first
+        # read in that case.
+        self.compress_type = compress_type
+        # Offset of the file data behind the local file header, found and
+        # memoized on first read.
+        self.data_offset = None
 
     def is_dir(self) -> bool:
         """Directories in a zip file should end with '/'."""
         return self.filename.endswith("/")
 
 
-def _read_eocd_mmap(m: mmap.mmap) -> Dict[str, ZipInfo]:
-    # Read end-of-central-directory (EOCD) from mmaped zipfile.
+@functools.lru_cache(maxsize=64)
+@no_type_check
+def _lzma_filter(properties: bytes):
+    # A zip file typically uses the same LZMA preset for all of its files,
+    # so the parsed filter properties are cached by their raw bytes. The
+    # LZMADecompressor itself is stateful and cannot be cached.
+    return lzma._decode_filter_properties(lzma.FILTER_LZMA1, properties)
+
+
+def _decode_filename(filename_bytes: bytes, flags: int) -> str:
+    # Trailing NUL padding is stripped here so that the NumPy fast path,
+    # whose "S" dtype drops trailing NULs on its own, and the scalar parse
+    # loop produce identical filenames.
+    filename_bytes = filename_bytes.rstrip(b"\0")
+
+    # General purpose bit 11 marks the filename as UTF-8. Otherwise, the
+    # encoding is CP437 as per the zip specification, which maps every byte
+    # to a character and therefore cannot fail.
+    if flags & 0x800:
+        return filename_bytes.decode("utf-8")
+    return filename_bytes.decode("cp437")
+
+
+@no_type_check
+def _read_central_directory_numpy(
+    buf: "_Buffer", buf_offset: int, num_files: int, directory_size: int
+) -> Optional[Dict[str, ZipInfo]]:
+    # Parse all central directory headers in one vectorized NumPy pass.
+    # This is only possible when all records have the same size, i.e. all
+    # filenames have the same length and there are no extra fields or
+    # comments. Returns None otherwise, in which case the caller falls back
+    # to the scalar parse loop.
+    if num_files == 0:
+        return None
+
+    filename_length, extra_length, comment_length = struct.unpack(
+        "<HHH", buf[buf_offset + 28 : buf_offset + 34]
+    )
+
+    if extra_length != 0 or comment_length != 0:
+        return None
+
+    record_size = 46 + filename_length
+    if num_files * record_size != directory_size:
+        return None
+
+    dtype = np.dtype(
+        [
+            ("signature", "<u4"),
+            ("version", "<u2"),
+            ("min_version", "<u2"),
+            ("flags", "<u2"),
+            ("compression", "<u2"),
+            ("time", "<u2"),
+            ("date", "<u2"),
+            ("crc32", "<u4"),
+            ("compressed_size", "<u4"),
+            ("uncompressed_size", "<u4"),
+            ("filename_length", "<u2"),
+            ("extra_length", "<u2"),
+            ("comment_length", "<u2"),
+            ("unused", "<u2"),
+            ("attributes0", "<u2"),
+            ("attributes1", "<u4"),
+            ("offset", "<u4"),
+            ("filename", f"S{filename_length}"),
+        ]
+    )
+
+    headers = np.frombuffer(buf, dtype=dtype, count=num_files, offset=buf_offset)
+
+    # Verify that the fixed record size assumption actually holds for every
+    # record before trusting any of the parsed fields.
+    if not (headers["signature"] == _CD_HEADER_SIGNATURE).all():
+        return None
+    if not (headers["filename_length"] == filename_length).all():
+        return None
+    if (headers["extra_length"] != 0).any() or (headers["comment_length"] != 0).any():
+        return None
 
-    # TODO Can zip64 EOCDs be larger?
-    max_eocd_size = 22 + 65536
-    end = m[-max_eocd_size:]
+    files: Dict[str, ZipInfo] = {}
+    for (
+        filename_bytes,
+        flags,
+        compression,
+        crc,
+        compressed_size,
+        uncompressed_size,
+        offset,
+    ) in zip(
+        headers["filename"].tolist(),
+        headers["flags"].tolist(),
+        headers["compression"].tolist(),
+        headers["crc32"].tolist(),
+        headers["compressed_size"].tolist(),
+        headers["uncompressed_size"].tolist(),
+        headers["offset"].tolist(),
+    ):
+        filename = _decode_filename(filename_bytes, flags)
+
+        files[filename] = ZipInfo(
+            filename,
+            offset,
+            crc,
+            compressed_size,
+            uncompressed_size,
+            compress_type=compression,
+        )
 
-    # Scan backwards until EOCD signature is found
-    # TODO this could fail if a comment contains the EOCD signature.
-    # Should employ sanity check to verify that an actual EOCD was found.
-    offset32 = end.rfind(b"PK\5\6")
+    return files
 
-    assert offset32 >= 0
 
-    eocd = struct.unpack("<4sHHHHIIH", end[offset32 : offset32 + 22])
+# Maximum size of EOCD record plus maximum comment length
+# TODO Can zip64 EOCDs be larger?
+_MAX_EOCD_SIZE = 22 + 65536
+
+
+def _find_central_directory(
+    end: bytes, read_at: Callable[[int, int], bytes]
+) -> Tuple[int, int, int]:
+    # Locate the central directory given the last bytes of a zip file
+    # (at least the last min(file size, _MAX_EOCD_SIZE) bytes). read_at
+    # returns the given number of bytes at an absolute file offset and is
+    # only used to read the zip64 EOCD record when one exists. Returns the
+    # number of files as well as size and offset of the central directory.
+
+    # Scan backwards until a valid EOCD record is found. A comment might
+    # contain the EOCD signature by chance, so verify that the comment length
+    # of the candidate record reaches exactly to the end of the file.
+    search_end = len(end)
+    while True:
+        offset32 = end.rfind(b"PK\5\6", 0, search_end)
+
+        assert offset32 >= 0
+
+        # A match within the last 21 bytes cannot be a complete EOCD record,
+        # so it must be part of a comment.
+        if offset32 + 22 > len(end):
+            search_end = offset32 + 3
+            continue
+
+        eocd = _EOCD_STRUCT.unpack_from(end, offset32)
+
+        if offset32 + 22 + eocd[7] == len(end):
+            break
+
+        search_end = offset32 + 3
 
     (
         signature,
@@ -71,15 +300,14 @@ def _read_eocd_mmap(m: mmap.mmap) -> Dict[str, ZipInfo]:
         comment_length,
     ) = eocd
 
-    assert signature == b"PK\5\6"
+    assert signature == _EOCD_SIGNATURE
 
     # Read zip64 end of central directory if locator exists
     locator_offset = end.rfind(b"PK\6\7")
     if locator_offset != -1:
         offset, = struct.unpack("<Q", end[locator_offset + 8: locator_offset + 16])
-        eocd64_data = m[offset: offset + 56]
 
-        eocd64 = struct.unpack("<4sQHHII4Q", eocd64_data)
+        eocd64 = _EOCD64_STRUCT.unpack_from(read_at(offset, 56))
 
         (
             eocd64_signature,
@@ -94,25 +322,39 @@ def _read_eocd_mmap(m: mmap.mmap) -> Dict[str, ZipInfo]:
             directory_offset,
         ) = eocd64
 
-        assert eocd64_signature == b"PK\6\6"
+        assert eocd64_signature == _EOCD64_SIGNATURE
+
+    return num_files, directory_size, directory_offset
+
+
+def _parse_central_directory(
+    buf: _Buffer, buf_offset: int, num_files: int, directory_size: int
+) -> Dict[str, ZipInfo]:
+    # Parse central directory headers which hold information about stored
+    # files. buf_offset is the position of the central directory in buf.
+    if HAVE_NUMPY:
+        # The explicit annotation keeps the Any produced by the unchecked
+        # NumPy helper from leaking into this function's return type.
+        files_or_none: Optional[Dict[str, ZipInfo]] = _read_central_directory_numpy(
+            buf, buf_offset, num_files, directory_size
+        )
+        if files_or_none is not None:
+            return files_or_none
 
-    # Read central directory headers which hold information about stored files
-    # as long as the signature matches
     files: Dict[str, ZipInfo] = {}
-    mmap_offset = directory_offset
+    # Hoisting the bound method out of the loop saves two attribute lookups
+    # per header.
+    unpack_cd_header = _CD_HEADER_STRUCT.unpack_from
     for _ in range(num_files):
-        header = m[mmap_offset : mmap_offset + 46]
-        mmap_offset += 46
-
         (
             signature,
             version,
             min_version,
-            unused0,
+            flags,
             compression,
             time,
             date,
-            crc32,
+            crc,
             compressed_size,
             uncompressed_size,
             filename_length,
@@ -122,48 +364,47 @@ def _read_eocd_mmap(m: mmap.mmap) -> Dict[str, ZipInfo]:
             attributes0,
             attributes1,
             offset,
-        ) = struct.unpack("<4s6H3I5HII", header)
-
-        assert signature == b"PK\1\2"
-
-        filename_bytes = m[mmap_offset : mmap_offset + filename_length]
-        mmap_offset += filename_length
-        extra = m[mmap_offset : mmap_offset + extra_length]
-        mmap_offset += extra_length + comment_length
-        for encoding in ["utf-8", "windows-1252", "CP437"]:
-            try:
-                filename = filename_bytes.rstrip(b"\0").decode(encoding)
-                break
-            except UnicodeDecodeError:
-                pass
-        else:
-            raise ValueError(f"Could not decode filename " + str(filename_bytes))
+        ) = unpack_cd_header(buf, buf_offset)
+        buf_offset += 46
+
+        assert signature == _CD_HEADER_SIGNATURE
+
+        filename_bytes = buf[buf_offset : buf_offset + filename_length]
+        buf_offset += filename_length
+
+        filename = _decode_filename(filename_bytes, flags)
+
+        if extra_length:
+            extra = buf[buf_offset : buf_offset + extra_length]
+
+            # TODO Figure out what those bytes mean.
+            # TODO Parse extra header correctly
+            extra = extra[4:]
 
-        # TODO Figure out what those bytes mean.
-        # TODO Parse extra header correctly
-        extra = extra[4:]
+            if uncompressed_size == 0xFFFFFFFF:
+                assert len(extra) >= 8
+                uncompressed_size = struct.unpack("<Q", extra[:8])[0]
+                extra = extra[8:]
 
-        if uncompressed_size == 0xFFFFFFFF:
-            assert len(extra) >= 8
-            uncompressed_size = struct.unpack("<Q", extra[:8])[0]
-            extra = extra[8:]
+            if compressed_size == 0xFFFFFFFF:
+                assert len(extra) >= 8
+                compressed_size = struct.unpack("<Q", extra[:8])[0]
+                extra = extra[8:]
 
-        if compressed_size == 0xFFFFFFFF:
-            assert len(extra) >= 8
-            compressed_size = struct.unpack("<Q", extra[:8])[0]
-            extra = extra[8:]
+            if offset == 0xFFFFFFFF:
+                assert len(extra) >= 8
+                offset = struct.unpack("<Q", extra[-8:])[0]
+                extra = extra[8:]
 
-        if offset == 0xFFFFFFFF:
-            assert len(extra) >= 8
-            offset = struct.unpack("<Q", extra[-8:])[0]
-            extra = extra[8:]
+        buf_offset += extra_length + comment_length
 
         info = ZipInfo(
             filename,
             offset,
-            crc32,
+            crc,
             compressed_size,
             uncompressed_size,
+            compress_type=compression,
         )
 
         files[filename] = info
@@ -171,11 +412,96 @@ def _read_eocd_mmap(m: mmap.mmap) -> Dict[str, ZipInfo]:
     return files
 
 
+def _read_eocd_mmap(m: mmap.mmap) -> Dict[str, ZipInfo]:
+    # Read end-of-central-directory (EOCD) from mmaped zipfile.
+    end = m[-_MAX_EOCD_SIZE:]
+
+    def read_at(offset: int, size: int) -> bytes:
+        return m[offset : offset + size]
+
+    num_files, directory_size, directory_offset = _find_central_directory(end, read_at)
+
+    if hasattr(m, "madvise"):
+        # Ask the kernel to fault in all central directory pages at once
+        # instead of one minor page fault at a time during the parse loop.
+        # The offset passed to madvise must be page-aligned.
+        page_offset = directory_offset - directory_offset % mmap.PAGESIZE
+        m.madvise(
+            mmap.MADV_WILLNEED,
+            page_offset,
+            directory_offset + directory_size - page_offset,
+        )
+
+    # Copy the central directory into one contiguous bytes object before
+    # parsing. This trades a single bulk copy for one minor page fault per
+    # 4 KiB page inside the parse loop on cold caches.
+    directory = m[directory_offset : directory_offset + directory_size]
+
+    return _parse_central_directory(directory, 0, num_files, directory_size)
+
+
 def read_files(filename: str) -> Dict[str, ZipInfo]:
-    """Read ZipInfo from zip file given its file path."""
+    """Read ZipInfo from zip file given its file path.
+
+    Only the end of the zip file and the central directory are read, with
+    two os.pread calls, instead of mmapping the whole file. This keeps the
+    cost per process low when many processes read the same large archive."""
+    if not hasattr(os, "pread"):
+        with open(filename, "rb") as f:
+            with mmap.mmap(f.fileno(), length=0, access=mmap.ACCESS_READ) as m:
+                return _read_eocd_mmap(m)
+
+    fd = os.open(filename, os.O_RDONLY)
+    try:
+        file_size = os.fstat(fd).st_size
+
+        end = os.pread(
+            fd, min(_MAX_EOCD_SIZE, file_size), max(0, file_size - _MAX_EOCD_SIZE)
+        )
+
+        def read_at(offset: int, size: int) -> bytes:
+            return os.pread(fd, size, offset)
+
+        num_files, directory_size, directory_offset = _find_central_directory(
+            end, read_at
+        )
+
+        directory = os.pread(fd, directory_size, directory_offset)
+    finally:
+        os.close(fd)
+
+    return _parse_central_directory(directory, 0, num_files, directory_size)
+
+
+def preload_to_shared(filename: str) -> shared_memory.SharedMemory:
+    """Copy a zip file into a shared memory block so that multiple processes
+    can read it with ParallelZipFile.from_shared without opening or mapping
+    the file themselves. The caller is responsible for closing and unlinking
+    the returned shared memory block when all readers are done."""
+    size = os.path.getsize(filename)
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    # SharedMemory.buf is typed Optional, but is always set for a new block
+    buf = shm.buf
+    assert buf is not None
     with open(filename, "rb") as f:
-        with mmap.mmap(f.fileno(), length=0, access=mmap.ACCESS_READ) as m:
-            return _read_eocd_mmap(m)
+        f.readinto(buf)
+    return shm
+
+
+# Zip file opened once per worker process by read_all_parallel.
+_per_process_zipfile: Optional["ParallelZipFile"] = None
+
+
+def _open_in_worker(filename: str, files: Dict[str, ZipInfo]) -> None:
+    # The ZipInfos are passed along so workers do not re-parse the central
+    # directory.
+    global _per_process_zipfile
+    _per_process_zipfile = ParallelZipFile(filename, files=files)
+
+
+def _read_in_worker(filename: str) -> bytes:
+    assert _per_process_zipfile is not None
+    return cast(bytes, _per_process_zipfile.read(filename))
 
 
 class ParallelZipFile:
@@ -184,24 +510,77 @@ class ParallelZipFile:
 
     filename: str
     files: Dict[str, ZipInfo]
-    f: IO[bytes]
-    m: mmap.mmap
+    f: Optional[IO[bytes]]
+    m: Union[mmap.mmap, memoryview]
+    _namelist: List[str]
+    _infolist: List[ZipInfo]
+    _shm: Optional[shared_memory.SharedMemory]
 
     def __init__(
-        self, file: str, mode: str = "r", files: Optional[Dict[str, ZipInfo]] = None
+        self,
+        file: str,
+        mode: str = "r",
+        files: Optional[Dict[str, ZipInfo]] = None,
+        preload: bool = False,
     ) -> None:
         assert mode == "r"
 
         f = open(file, "rb")
+
+        if preload and hasattr(os, "posix_fadvise"):
+            # Start asynchronous readahead of the whole archive so that file
+            # contents are already in the page cache by the time read() is
+            # called. Useful when most files will be read and the file is not
+            # cached yet, e.g. directly after downloading a large archive.
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+
         m = mmap.mmap(f.fileno(), length=0, access=mmap.ACCESS_READ)
 
         if files is None:
             files = _read_eocd_mmap(m)
 
+        if hasattr(m, "madvise"):
+            # read() accesses file contents in arbitrary order, so the
+            # default sequential readahead would read pages that are never
+            # used and evict useful ones.
+            m.madvise(mmap.MADV_RANDOM)
+
         self.filename: str = file
         self.files = files
         self.f = f
         self.m = m
+        self._shm = None
+        # The file table does not change after opening, so the results of
+        # namelist() and infolist() can be computed once and reused.
+        self._namelist = list(files.keys())
+        self._infolist = list(files.values())
+
+    @classmethod
+    def from_shared(
+        cls, shm_name: str, files: Dict[str, ZipInfo]
+    ) -> "ParallelZipFile":
+        """Open a zip file that was copied into shared memory with
+        preload_to_shared, given the name of the shared memory block and the
+        file table from read_files. Attaching to the existing block skips
+        the open and mmap of the zip file entirely, so worker processes
+        share one copy of the archive instead of mapping it each. The
+        resulting object has no backing file on disk, so read_all_parallel
+        is not available on it."""
+        shm = shared_memory.SharedMemory(shm_name)
+
+        # SharedMemory.buf is typed Optional, but is always set after attach
+        buf = shm.buf
+        assert buf is not None
+
+        z = cls.__new__(cls)
+        z.filename = shm_name
+        z.files = files
+        z.f = None
+        z.m = buf
+        z._shm = shm
+        z._namelist = list(files.keys())
+        z._infolist = list(files.values())
+        return z
 
     def __contains__(self, filename: str) -> bool:
         return filename in self.files
@@ -216,79 +595,193 @@ class ParallelZipFile:
     def close(self) -> None:
         """Close internal file and mmap objects. Will be called automatically
         when using context manager, i.e. "with" statement."""
-        if not isinstance(self.m, bytes):
+        if self._shm is not None:
+            # Detach from the shared memory block. Unlinking is left to
+            # whoever created it with preload_to_shared.
+            self._shm.close()
+            return
+        if isinstance(self.m, mmap.mmap):
             self.m.close()
-        self.f.close()
+        if self.f is not None:
+            self.f.close()
 
     def namelist(self) -> List[str]:
-        """Get file names for each file stored in zip file."""
-        return list(self.files.keys())
+        """Get file names for each file stored in zip file.
+        The returned list is cached and must not be modified."""
+        return self._namelist
 
     def infolist(self) -> List[ZipInfo]:
-        """Get list of ZipInfo objects for each file stored in zip file."""
-        return list(self.files.values())
+        """Get list of ZipInfo objects for each file stored in zip file.
+        The returned list is cached and must not be modified."""
+        return self._infolist
+
+    def read_all_parallel(self, processes: Optional[int] = None) -> Dict[str, bytes]:
+        """Read all files using a pool of worker processes and return a dict
+        mapping filenames to their contents. Unlike read_many, this bypasses
+        the GIL entirely and also parallelizes the Python-level overhead of
+        read(), at the cost of sending file contents between processes.
+        Not available for zip files opened with from_shared, since workers
+        reopen the archive by its path."""
+        if self._shm is not None:
+            raise ValueError(
+                "read_all_parallel is not supported for zip files opened with"
+                " from_shared, because worker processes reopen the archive by"
+                " its path. Attach each worker with from_shared instead."
+            )
 
-    def read(self, filename: str) -> bytes:
-        """Get bytes for file stored in zip file given its filename."""
         files = self.files
+        filenames = list(files.keys())
 
-        if filename not in files:
-            raise ValueError(f"{filename} does not exist")
+        if processes is None:
+            processes = os.cpu_count() or 1
 
-        fileinfo = files[filename]
+        # Larger chunks amortize the cost of inter-process communication.
+        chunksize = max(1, len(filenames) // (processes * 4))
 
-        offset = fileinfo.header_offset
+        with multiprocessing.Pool(
+            processes, initializer=_open_in_worker, initargs=(self.filename, files)
+        ) as pool:
+            data = pool.map(_read_in_worker, filenames, chunksize=chunksize)
+
+        return dict(zip(filenames, data))
+
+    def read_many(
+        self,
+        filenames: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, bytes]:
+        """Read multiple files in parallel using a thread pool and return a
+        dict mapping filenames to their contents. Reads all files when no
+        filenames are given. Decompression releases the GIL, so multiple
+        threads speed this up even within a single process."""
+        files = self.files
+
+        if filenames is None:
+            filenames = list(files.keys())
+        else:
+            # Fail like read() does instead of raising KeyError from the
+            # chunk partitioning below
+            for filename in filenames:
+                if filename not in files:
+                    raise ValueError(f"{filename} does not exist")
+
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+
+        num_workers = max(1, min(max_workers, len(filenames)))
+
+        # Distribute files over workers such that each worker gets roughly
+        # the same amount of compressed data to decompress.
+        chunks: List[List[str]] = [[] for _ in range(num_workers)]
+        chunk_sizes = [0] * num_workers
+        for filename in sorted(
+            filenames, key=lambda name: files[name].compress_size, reverse=True
+        ):
+            i = chunk_sizes.index(min(chunk_sizes))
+            chunks[i].append(filename)
+            chunk_sizes[i] += files[filename].compress_size
+
+        def read_chunk(chunk: List[str]) -> Dict[str, bytes]:
+            return {filename: cast(bytes, self.read(filename)) for filename in chunk}
+
+        data: Dict[str, bytes] = {}
+        with concurrent.futures.ThreadPoolExecutor(num_workers) as executor:
+            for chunk_data in executor.map(read_chunk, chunks):
+                data.update(chunk_data)
+
+        return data
+
+    def read(self, filename: str, copy: bool = True) -> Union[bytes, memoryview]:
+        """Get bytes for file stored in zip file given its filename.
+
+        If copy is False and the file is stored without compression, a
+        zero-copy memoryview into the zip file is returned instead of a new
+        bytes object. The view must be released before closing the zip file.
+        """
+        # A single dict lookup instead of a containment check plus lookup
+        fileinfo = self.files.get(filename)
+
+        if fileinfo is None:
+            raise ValueError(f"{filename} does not exist")
 
         m = self.m
 
-        header = m[offset : offset + 30]
+        offset = fileinfo.data_offset
 
-        if len(header) < 30:
-            error_message = f"Header for {filename} too small ({len(header)} bytes, but must be at least 30 bytes)"
-            raise ValueError(error_message)
+        if offset is None:
+            # Parse the local file header once to find where the file data
+            # starts. The filename and extra field lengths can differ from
+            # those in the central directory, so the local values must be
+            # used. The result is memoized, so repeated reads skip this.
+            header_offset = fileinfo.header_offset
 
-        (
-            signature,
-            version,
-            unused,
-            compression,
-            time,
-            date,
-            crc32,
-            compressed_size,
-            uncompressed_size,
-            filename_length,
-            extra_length,
-        ) = struct.unpack("<IHHHHHIIIHH", header)
+            header_size = len(m) - header_offset
+
+            if header_size < 30:
+                error_message = f"Header for {filename} too small ({header_size} bytes, but must be at least 30 bytes)"
+                raise ValueError(error_message)
+
+            (
+                signature,
+                version,
+                unused,
+                compression,
+                time,
+                date,
+                crc,
+                compressed_size,
+                uncompressed_size,
+                filename_length,
+                extra_length,
+            ) = _LOCAL_HEADER_STRUCT.unpack_from(m, header_offset)
+
+            assert signature == _LOCAL_HEADER_SIGNATURE
 
-        # TODO Is this legal/the indented way to do this?
-        if compressed_size != fileinfo.compress_size:
-            compressed_size = fileinfo.compress_size
+            offset = header_offset + 30 + filename_length + extra_length
+            fileinfo.data_offset = offset
 
-        offset += 30 + filename_length + extra_length
+            if fileinfo.compress_type < 0:
+                # ZipInfo was constructed without a compression method
+                fileinfo.compress_type = compression
 
-        compressed = m[offset : offset + compressed_size]
-        assert signature == 0x4034B50
+        compression = fileinfo.compress_type
+        compressed_size = fileinfo.compress_size
 
         if compression == 0:
-            # No compression
-            return compressed
-        elif compression == 8:
+            # No compression. bytes() is a no-op for the mmap backend, which
+            # already slices to bytes, but materializes the memoryview slice
+            # of the shared memory backend.
+            if not copy:
+                return memoryview(m)[offset : offset + compressed_size]
+            return bytes(m[offset : offset + compressed_size])
+
+        # All decompressors accept buffer-protocol objects, so a zero-copy
+        # view into the mmap avoids copying the compressed data first.
+        compressed = memoryview(m)[offset : offset + compressed_size]
+
+        if compression == 8:
             # DEFLATE compression
-            decompress = zlib.decompressobj(-zlib.MAX_WBITS)
-            return decompress.decompress(compressed)
+            if HAVE_LIBDEFLATE:
+                return cast(
+                    bytes, deflate.deflate_decompress(compressed, fileinfo.file_size)
+                )
+            if HAVE_ISAL:
+                return isal_zlib.decompress(
+                    compressed, -isal_zlib.MAX_WBITS, fileinfo.file_size
+                )
+            # One-shot decompression releases the GIL for the whole call and
+            # the bufsize hint avoids zlib's internal buffer-growth loop.
+            return zlib.decompress(compressed, -zlib.MAX_WBITS, fileinfo.file_size)
         elif compression == 12:
             return bz2.decompress(compressed)
         elif compression == 14:
             # LZMA compression
             _, size = struct.unpack("<HH", compressed[:4])
             assert len(compressed) >= 4 + size
-            filt = lzma._decode_filter_properties(lzma.FILTER_LZMA1, compressed[4:4 + size])
+            filt = _lzma_filter(bytes(compressed[4:4 + size]))
             decompress = lzma.LZMADecompressor(lzma.FORMAT_RAW, filters=[filt])
-            decompressed = decompress.decompress(compressed[4 + size:])
-            # Decompresses too much data sometimes
-            decompressed = decompressed[:uncompressed_size]
-            return decompressed
+            # Would decompress too much data sometimes without max_length
+            return decompress.decompress(compressed[4 + size:], fileinfo.file_size)
         else:
             error_message = f"Compression method {compression} not implemented"
             raise NotImplementedError(error_message)